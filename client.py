@@ -0,0 +1,85 @@
+"""
+Lightweight client for the local analysis service
+Uses only the standard library so startup stays fast
+"""
+
+import sys
+import json
+import argparse
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+from typing import Dict, Optional
+
+from config import ServiceConfig
+
+
+QUERIES = ('pcr', 'max_pain', 'levels', 'strategies', 'analysis', 'expiries', 'compare')
+
+
+class ServiceUnreachable(Exception):
+    """Raised when the analysis service cannot be contacted"""
+
+
+def query(name: str, symbol: str = 'NIFTY', expiry: Optional[str] = None,
+          refresh: bool = False, host: str = ServiceConfig.HOST,
+          port: int = ServiceConfig.PORT) -> Dict:
+    """
+    Query the running analysis service
+
+    Args:
+        name: One of pcr, max_pain, levels, strategies, analysis, expiries, compare
+        symbol: Index or stock symbol, comma separated for compare
+        expiry: Expiry date as reported by NSE, or None for all expiries
+        refresh: Ask the service to fetch fresh data
+
+    Returns:
+        Decoded JSON response; error responses carry an 'error' key
+
+    Raises:
+        ServiceUnreachable: If nothing answers at host:port
+    """
+    params = {'symbols' if name == 'compare' else 'symbol': symbol}
+    if expiry:
+        params['expiry'] = expiry
+    if refresh:
+        params['refresh'] = '1'
+
+    url = f"http://{host}:{port}/{name}?{urlencode(params)}"
+    try:
+        with urlopen(url, timeout=ServiceConfig.CLIENT_TIMEOUT) as response:
+            return json.loads(response.read())
+    except HTTPError as e:
+        body = e.read()
+        try:
+            return json.loads(body)
+        except ValueError:
+            return {'error': f"HTTP {e.code}: {body.decode('utf-8', 'replace')[:200]}"}
+    except (URLError, OSError) as e:
+        raise ServiceUnreachable(f"service not reachable at {host}:{port}") from e
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the NSE analysis service")
+    parser.add_argument('query', choices=QUERIES)
+    parser.add_argument('symbol', nargs='?', default='NIFTY')
+    parser.add_argument('--expiry')
+    parser.add_argument('--refresh', action='store_true')
+    parser.add_argument('--host', default=ServiceConfig.HOST)
+    parser.add_argument('--port', type=int, default=ServiceConfig.PORT)
+    args = parser.parse_args()
+
+    try:
+        result = query(args.query, args.symbol.upper(), args.expiry, args.refresh,
+                       args.host, args.port)
+    except ServiceUnreachable as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps(result, indent=2))
+    if 'error' in result:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
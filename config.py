@@ -73,3 +73,57 @@ class TradingConfig:
         'FINNIFTY': 50,
         'MIDCPNIFTY': 25
     }
+
+
+class ServiceConfig:
+    """Local analysis service configuration"""
+    
+    # Bind address (local only)
+    HOST = "127.0.0.1"
+    PORT = 8765
+    
+    # Seconds before a cached option chain is fetched again
+    CACHE_TTL = 60
+    
+    # Client request timeout
+    CLIENT_TIMEOUT = 30
+
+
+class AlertConfig:
+    """Alert engine configuration"""
+    
+    # Seconds between polling ticks
+    POLL_INTERVAL = 60
+    
+    # Consecutive ticks a condition must hold before alerting
+    DEBOUNCE_TICKS = 2
+    
+    # Distance a metric must retreat past its threshold to re-arm
+    PCR_HYSTERESIS = 0.05
+    IV_SKEW_HYSTERESIS = 2
+    
+    # Pending alerts kept for the sinks before new ones are dropped
+    QUEUE_SIZE = 1000
+    
+    # Recent alerts kept for latency reporting
+    HISTORY_SIZE = 500
+    
+    # Webhook request timeout
+    WEBHOOK_TIMEOUT = 5
+
+
+class TransportConfig:
+    """HTTP transport configuration"""
+    
+    # Connection pools (per host) and connections kept alive per pool
+    POOL_CONNECTIONS = 4
+    POOL_MAXSIZE = 10
+    
+    # Use HTTP/2 when httpx with h2 is installed
+    ENABLE_HTTP2 = False
+    
+    # Content encodings in order of preference (only installed codecs are offered)
+    ENCODING_PREFERENCE = ['br', 'zstd', 'gzip', 'deflate']
+    
+    # Recent transfers kept for payload-size accounting
+    STATS_HISTORY = 100
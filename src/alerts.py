@@ -0,0 +1,349 @@
+"""
+Alert Engine Module
+Debounced threshold, change and new-level alerts evaluated on every polling tick
+"""
+
+import json
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Union
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import AlertConfig, AnalysisConfig, TradingConfig
+
+logger = logging.getLogger(__name__)
+
+
+class AlertRule:
+    """
+    Base rule: resolves a metric from an analysis and debounces its condition
+
+    The metric is either a dotted path into the analysis dictionary
+    (e.g. 'pcr.oi') or a callable taking the analysis. Each rule keeps one
+    small state dictionary per symbol and only compares against it.
+    """
+
+    def __init__(self, name: str, metric: Union[str, Callable],
+                 debounce: int = AlertConfig.DEBOUNCE_TICKS):
+        self.name = name
+        self.metric = metric
+        self.debounce = max(1, debounce)
+        self._states = {}
+
+    def resolve(self, analysis: Dict):
+        """Extract the metric value from an analysis"""
+        if callable(self.metric):
+            return self.metric(analysis)
+
+        value = analysis
+        for key in self.metric.split('.'):
+            if not isinstance(value, dict) or key not in value:
+                return None
+            value = value[key]
+        return value
+
+    def _debounced(self, state: Dict, active: bool) -> bool:
+        """True when a condition has held for `debounce` ticks; restarts the count"""
+        if not active:
+            state['hits'] = 0
+            return False
+        state['hits'] = state.get('hits', 0) + 1
+        if state['hits'] >= self.debounce:
+            state['hits'] = 0
+            return True
+        return False
+
+    def evaluate(self, symbol: str, analysis: Dict) -> Optional[Dict]:
+        """
+        Check the rule against the previous state for a symbol
+
+        Returns:
+            Alert dictionary or None
+        """
+        value = self.resolve(analysis)
+        if value is None:
+            return None
+
+        state = self._states.setdefault(symbol, {})
+        message = self.check(symbol, state, value)
+        if not message:
+            return None
+
+        return {
+            'rule': self.name,
+            'symbol': symbol,
+            'value': value,
+            'message': message
+        }
+
+    def check(self, symbol: str, state: Dict, value) -> Optional[str]:
+        """Update the state with a new value and return a message to alert"""
+        raise NotImplementedError
+
+
+class ThresholdRule(AlertRule):
+    """
+    Alerts when a metric crosses a threshold, re-arming with hysteresis
+    """
+
+    def __init__(self, name: str, metric: Union[str, Callable], threshold: float,
+                 direction: str = 'above', hysteresis: float = 0,
+                 debounce: int = AlertConfig.DEBOUNCE_TICKS):
+        super().__init__(name, metric, debounce)
+        if direction not in ('above', 'below'):
+            raise ValueError(f"Invalid direction: {direction}")
+        self.threshold = threshold
+        self.direction = direction
+        self.hysteresis = abs(hysteresis)
+
+    def check(self, symbol: str, state: Dict, value) -> Optional[str]:
+        if self.direction == 'above':
+            beyond = value > self.threshold
+            rearm = value < self.threshold - self.hysteresis
+        else:
+            beyond = value < self.threshold
+            rearm = value > self.threshold + self.hysteresis
+
+        if rearm:
+            state['armed'] = True
+        armed = state.get('armed', True)
+
+        if self._debounced(state, armed and beyond):
+            state['armed'] = False
+            return f"{self.name}: {value} crossed {self.direction} {self.threshold}"
+        return None
+
+
+class ChangeRule(AlertRule):
+    """
+    Alerts when a metric moves more than `min_change` from its last alerted value
+
+    `min_change` may be a dictionary keyed by symbol, e.g. STRIKE_GAPS.
+    """
+
+    def __init__(self, name: str, metric: Union[str, Callable],
+                 min_change: Union[float, Dict[str, float]],
+                 debounce: int = AlertConfig.DEBOUNCE_TICKS):
+        super().__init__(name, metric, debounce)
+        self.min_change = min_change
+
+    def check(self, symbol: str, state: Dict, value) -> Optional[str]:
+        if isinstance(self.min_change, dict):
+            min_change = self.min_change.get(symbol)
+            if min_change is None:
+                return None
+        else:
+            min_change = self.min_change
+
+        if 'reference' not in state:
+            state['reference'] = value
+            return None
+
+        reference = state['reference']
+        if self._debounced(state, abs(value - reference) > min_change):
+            state['reference'] = value
+            return f"{self.name}: moved from {reference} to {value}"
+        return None
+
+
+class NewMemberRule(AlertRule):
+    """
+    Alerts when a list metric gains a member it did not have before
+
+    A new member must stay for `debounce` consecutive ticks; a different
+    new member on the next tick restarts the count.
+    """
+
+    def check(self, symbol: str, state: Dict, value) -> Optional[str]:
+        current = set(value)
+
+        if 'known' not in state:
+            state['known'] = current
+            return None
+
+        new_members = current - state['known']
+        if not new_members:
+            state['known'] = current
+            state.pop('pending', None)
+            state['hits'] = 0
+            return None
+
+        persisting = new_members & state.get('pending', set())
+        if not persisting:
+            state['hits'] = 0
+            persisting = new_members
+        state['pending'] = persisting
+
+        if self._debounced(state, True):
+            state['known'] = (state['known'] & current) | persisting
+            state.pop('pending')
+            return f"{self.name}: {sorted(persisting)}"
+        return None
+
+
+class StdoutSink:
+    """Prints alerts"""
+
+    def send(self, alert: Dict):
+        print(f"🔔 [{alert['symbol']}] {alert['message']}")
+
+
+class FileSink:
+    """Appends alerts to a file as JSON lines"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, alert: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(alert, default=str) + '\n')
+
+
+class WebhookSink:
+    """Posts alerts as JSON to a local webhook"""
+
+    def __init__(self, url: str, timeout: float = AlertConfig.WEBHOOK_TIMEOUT):
+        import requests
+
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, alert: Dict):
+        response = self.session.post(
+            self.url,
+            data=json.dumps(alert, default=str),
+            headers={'Content-Type': 'application/json'},
+            timeout=self.timeout
+        )
+        if response.status_code >= 400:
+            logger.error(f"Webhook rejected alert: {response.status_code}")
+
+
+def default_rules() -> List[AlertRule]:
+    """Rules covering the signals that used to be read off the printed output"""
+    return [
+        ThresholdRule('PCR Bullish Extreme', 'pcr.oi',
+                      AnalysisConfig.PCR_BULLISH_THRESHOLD, 'above',
+                      hysteresis=AlertConfig.PCR_HYSTERESIS),
+        ThresholdRule('PCR Bearish Extreme', 'pcr.oi',
+                      AnalysisConfig.PCR_BEARISH_THRESHOLD, 'below',
+                      hysteresis=AlertConfig.PCR_HYSTERESIS),
+        ThresholdRule('IV Put Skew Extreme', 'iv_skew.put_skew',
+                      AnalysisConfig.IV_SKEW_EXTREME, 'above',
+                      hysteresis=AlertConfig.IV_SKEW_HYSTERESIS),
+        ThresholdRule('IV Put Skew Reversal', 'iv_skew.put_skew',
+                      -AnalysisConfig.IV_SKEW_EXTREME, 'below',
+                      hysteresis=AlertConfig.IV_SKEW_HYSTERESIS),
+        ChangeRule('Max Pain Shift', 'max_pain', TradingConfig.STRIKE_GAPS),
+        NewMemberRule('New Resistance Level', 'support_resistance.resistance_levels'),
+        NewMemberRule('New Support Level', 'support_resistance.support_levels'),
+        NewMemberRule('New Strategy',
+                      lambda analysis: [s['name'] for s in analysis.get('strategies', [])]),
+    ]
+
+
+class AlertEngine:
+    """
+    Evaluates rules on each tick and hands alerts to sinks on a background thread
+    """
+
+    def __init__(self, rules: Optional[List[AlertRule]] = None,
+                 sinks: Optional[List] = None,
+                 queue_size: int = AlertConfig.QUEUE_SIZE):
+        self.rules = rules if rules is not None else default_rules()
+        self.sinks = sinks if sinks is not None else [StdoutSink()]
+        self.history = deque(maxlen=AlertConfig.HISTORY_SIZE)
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._worker = threading.Thread(target=self._dispatch, daemon=True)
+        self._worker.start()
+
+    def evaluate(self, symbol: str, analysis: Dict,
+                 tick_time: Optional[float] = None) -> List[Dict]:
+        """
+        Evaluate all rules for one symbol's tick without blocking on sinks
+
+        Args:
+            symbol: Symbol the analysis belongs to
+            analysis: Analysis dictionary for this tick
+            tick_time: time.monotonic() when the tick's data arrived
+
+        Returns:
+            Alerts raised on this tick
+        """
+        if tick_time is None:
+            tick_time = time.monotonic()
+
+        alerts = []
+        for rule in self.rules:
+            try:
+                alert = rule.evaluate(symbol, analysis)
+            except Exception as e:
+                logger.error(f"Error evaluating rule {rule.name}: {str(e)}")
+                continue
+
+            if alert:
+                alert['tick_time'] = tick_time
+                alert['timestamp'] = datetime.now().astimezone().isoformat(timespec='milliseconds')
+                alerts.append(alert)
+                try:
+                    self._queue.put_nowait(alert)
+                except queue.Full:
+                    self.dropped += 1
+                    logger.warning(f"Alert queue full, dropped {rule.name} for {symbol}")
+
+        return alerts
+
+    def _dispatch(self):
+        """Deliver queued alerts to every sink"""
+        while True:
+            alert = self._queue.get()
+            if alert is None:
+                break
+
+            for sink in self.sinks:
+                try:
+                    sink.send(alert)
+                except Exception as e:
+                    logger.error(f"Error sending alert to {type(sink).__name__}: {str(e)}")
+
+            alert['latency_ms'] = round((time.monotonic() - alert['tick_time']) * 1000, 3)
+            self.history.append(alert)
+            self._queue.task_done()
+
+    def latency_stats(self) -> Dict:
+        """Tick-to-alert latency over recently delivered alerts"""
+        latencies = sorted(a['latency_ms'] for a in list(self.history))
+        if not latencies:
+            return {'count': 0, 'dropped': self.dropped}
+
+        return {
+            'count': len(latencies),
+            'dropped': self.dropped,
+            'avg_ms': round(sum(latencies) / len(latencies), 3),
+            'p50_ms': latencies[len(latencies) // 2],
+            'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            'max_ms': latencies[-1]
+        }
+
+    def stop(self):
+        """Flush pending alerts and stop the dispatcher"""
+        self._queue.put(None)
+        self._worker.join()
+
+
+if __name__ == "__main__":
+    engine = AlertEngine()
+    for pcr in (1.0, 1.4, 1.45, 1.32, 1.4, 1.2, 1.4, 1.5):
+        engine.evaluate('NIFTY', {'pcr': {'oi': pcr}})
+    engine.stop()
+    print(f"Latency: {engine.latency_stats()}")
@@ -0,0 +1,257 @@
+"""
+Batch Indicators Module
+Cross-sectional indicators computed for many option chains at once
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Tuple
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import AnalysisConfig
+
+
+class ChainBatch:
+    """
+    Many parsed option chains stacked into padded (symbols x strikes) arrays
+
+    Rows keep each chain's original row order. `offsets` and `lengths` index
+    each symbol's slice of the flat, concatenated (ragged) arrays.
+    """
+
+    COLUMNS = [
+        'strike',
+        'CE_OI', 'CE_volume', 'CE_IV', 'CE_LTP', 'CE_bid', 'CE_ask',
+        'PE_OI', 'PE_volume', 'PE_IV', 'PE_LTP', 'PE_bid', 'PE_ask',
+    ]
+
+    def __init__(self, chains: Dict[str, Tuple[pd.DataFrame, float]]):
+        """
+        Args:
+            chains: Mapping of symbol to (parsed DataFrame, spot price)
+        """
+        self.symbols = list(chains.keys())
+        self.spot = np.array([float(spot) for _, spot in chains.values()])
+        self.lengths = np.array([len(df) for df, _ in chains.values()], dtype=np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(self.lengths)[:-1])).astype(np.int64)
+
+        n, width = len(self.symbols), int(self.lengths.max()) if len(self.lengths) else 0
+        rows = np.repeat(np.arange(n), self.lengths)
+        cols = np.arange(self.lengths.sum()) - np.repeat(self.offsets, self.lengths)
+
+        self.flat = {}
+        self.arrays = {}
+        for col in self.COLUMNS:
+            self.flat[col] = np.concatenate([
+                df[col].to_numpy(dtype=float) if col in df else np.zeros(len(df))
+                for df, _ in chains.values()
+            ]) if n else np.empty(0)
+
+            padded = np.full((n, width), np.nan)
+            padded[rows, cols] = self.flat[col]
+            self.arrays[col] = padded
+
+        self.mask = np.zeros((n, width), dtype=bool)
+        self.mask[rows, cols] = True
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __getitem__(self, col: str) -> np.ndarray:
+        return self.arrays[col]
+
+    def index_of(self, symbol: str) -> slice:
+        """Slice of a symbol's rows in the flat arrays"""
+        i = self.symbols.index(symbol)
+        return slice(self.offsets[i], self.offsets[i] + self.lengths[i])
+
+
+def _nanmean(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Row means over masked, non-NaN entries (NaN for empty rows)"""
+    valid = mask & ~np.isnan(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(valid, values, 0).sum(axis=1) / valid.sum(axis=1)
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """Element-wise ratio with infinities replaced by 0, as in OptionIndicators"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = num / den
+    ratio[np.isinf(ratio)] = 0
+    return ratio
+
+
+def _top_strikes(batch: ChainBatch, key: np.ndarray, eligible: np.ndarray, k: int) -> List[List]:
+    """Strikes of the k largest `key` values per row among eligible entries"""
+    ranked = np.where(eligible, key, -np.inf)
+    order = np.argsort(-ranked, axis=1, kind='stable')[:, :k]
+    picked = np.take_along_axis(batch['strike'], order, axis=1)
+    keep = np.take_along_axis(eligible, order, axis=1)
+    return [row[ok].tolist() for row, ok in zip(picked, keep)]
+
+
+class BatchIndicators:
+    """
+    Vectorized equivalents of OptionChainAnalyzer/OptionIndicators over a ChainBatch
+    """
+
+    # Metrics comparable across symbols (strike levels are not)
+    CROSS_SECTIONAL_METRICS = [
+        'pcr_oi', 'pcr_volume',
+        'atm_iv', 'put_skew', 'call_skew',
+        'liquid_ce_strikes', 'liquid_pe_strikes', 'avg_ce_spread', 'avg_pe_spread',
+        'avg_ce_ratio', 'avg_pe_ratio',
+    ]
+
+    @staticmethod
+    def calculate_pcr(batch: ChainBatch) -> Dict[str, np.ndarray]:
+        """Put-Call Ratio by OI and volume for every symbol"""
+        result = {}
+        for name, suffix in (('pcr_oi', 'OI'), ('pcr_volume', 'volume')):
+            calls = np.nansum(batch[f'CE_{suffix}'], axis=1)
+            puts = np.nansum(batch[f'PE_{suffix}'], axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                pcr = np.where(calls > 0, puts / calls, 0)
+            result[name] = np.round(pcr, 3)
+        return result
+
+    @staticmethod
+    def calculate_max_pain(batch: ChainBatch) -> np.ndarray:
+        """
+        Max Pain strike for every symbol
+
+        Pain at strike k is sum((k - s) * CE_OI for s < k) + sum((s - k) * PE_OI for s > k),
+        evaluated for all strikes at once from cumulative sums over sorted strikes.
+        Equal strikes contribute zero, so duplicate strikes get the same pain.
+        Strikes tied for minimum pain resolve to the one appearing first in row
+        order, as in OptionChainAnalyzer.calculate_max_pain.
+        """
+        strikes = np.where(batch.mask, batch['strike'], np.inf)
+        order = np.argsort(strikes, axis=1, kind='stable')
+        s = np.take_along_axis(strikes, order, axis=1)
+        valid = np.isfinite(s)
+        s0 = np.where(valid, s, 0)
+        ce = np.where(valid, np.take_along_axis(np.nan_to_num(batch['CE_OI']), order, axis=1), 0)
+        pe = np.where(valid, np.take_along_axis(np.nan_to_num(batch['PE_OI']), order, axis=1), 0)
+
+        ce_below = np.cumsum(ce, axis=1)
+        sce_below = np.cumsum(s0 * ce, axis=1)
+        pe_above = pe.sum(axis=1, keepdims=True) - np.cumsum(pe, axis=1)
+        spe_above = (s0 * pe).sum(axis=1, keepdims=True) - np.cumsum(s0 * pe, axis=1)
+
+        pain = s0 * ce_below - sce_below + spe_above - s0 * pe_above
+        pain = np.where(valid, pain, np.inf)
+
+        # Back to row order, then take the first row holding the minimum
+        row_pain = np.empty_like(pain)
+        np.put_along_axis(row_pain, order, pain, axis=1)
+        best = np.argmax(row_pain == row_pain.min(axis=1, keepdims=True), axis=1)
+        strikes = np.where(batch.mask, batch['strike'], 0)
+        return np.take_along_axis(strikes, best[:, None], axis=1)[:, 0].astype(np.int64)
+
+    @staticmethod
+    def calculate_iv_skew(batch: ChainBatch) -> Dict[str, np.ndarray]:
+        """ATM IV and OTM put/call skew for every symbol"""
+        strikes = batch['strike']
+        distance = np.where(batch.mask, np.abs(strikes - batch.spot[:, None]), np.inf)
+        atm_idx = np.argmin(distance, axis=1)[:, None]
+
+        atm_strike = np.take_along_axis(strikes, atm_idx, axis=1)
+        atm_iv = ((np.take_along_axis(batch['CE_IV'], atm_idx, axis=1) +
+                   np.take_along_axis(batch['PE_IV'], atm_idx, axis=1)) / 2)[:, 0]
+
+        # First 5 rows above ATM and last 5 rows below ATM, in row order
+        above = batch.mask & (strikes > atm_strike)
+        below = batch.mask & (strikes < atm_strike)
+        otm_calls = above & (np.cumsum(above, axis=1) <= 5)
+        otm_puts = below & (np.cumsum(below[:, ::-1], axis=1)[:, ::-1] <= 5)
+
+        avg_otm_call_iv = _nanmean(batch['CE_IV'], otm_calls)
+        avg_otm_put_iv = _nanmean(batch['PE_IV'], otm_puts)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            put_skew = np.where(atm_iv > 0, (avg_otm_put_iv - atm_iv) / atm_iv * 100, 0)
+            call_skew = np.where(atm_iv > 0, (avg_otm_call_iv - atm_iv) / atm_iv * 100, 0)
+
+        return {
+            'atm_strike': atm_strike[:, 0],
+            'atm_iv': np.round(atm_iv, 2),
+            'put_skew': np.round(put_skew, 2),
+            'call_skew': np.round(call_skew, 2),
+        }
+
+    @staticmethod
+    def analyze_liquidity(batch: ChainBatch) -> Dict[str, np.ndarray]:
+        """Bid-ask spread liquidity for every symbol"""
+        result = {}
+        for side in ('CE', 'PE'):
+            spread = _ratio(batch[f'{side}_ask'] - batch[f'{side}_bid'], batch[f'{side}_LTP']) * 100
+            with np.errstate(invalid='ignore'):
+                liquid = (batch.mask & (spread < AnalysisConfig.MAX_SPREAD_PCT) &
+                          (batch[f'{side}_volume'] > AnalysisConfig.MIN_VOLUME))
+            result[f'liquid_{side.lower()}_strikes'] = liquid.sum(axis=1)
+            result[f'avg_{side.lower()}_spread'] = np.round(_nanmean(spread, batch.mask), 2)
+        return result
+
+    @staticmethod
+    def calculate_volume_oi_ratio(batch: ChainBatch) -> Dict:
+        """Volume/OI ratio and high-activity strikes for every symbol"""
+        result = {}
+        for side in ('CE', 'PE'):
+            ratio = _ratio(batch[f'{side}_volume'], batch[f'{side}_OI'])
+            with np.errstate(invalid='ignore'):
+                active = batch.mask & (ratio > AnalysisConfig.HIGH_ACTIVITY_RATIO)
+            result[f'avg_{side.lower()}_ratio'] = np.round(_nanmean(ratio, batch.mask), 3)
+            result[f'high_activity_{side.lower()}_strikes'] = _top_strikes(
+                batch, np.nan_to_num(batch[f'{side}_volume']), active, 5
+            )
+        return result
+
+    @staticmethod
+    def find_support_resistance(batch: ChainBatch) -> Dict:
+        """OI-based support/resistance levels for every symbol"""
+        ce_oi = np.nan_to_num(batch['CE_OI'])
+        pe_oi = np.nan_to_num(batch['PE_OI'])
+        return {
+            'resistance_levels': _top_strikes(batch, ce_oi, batch.mask, 3),
+            'support_levels': _top_strikes(batch, pe_oi, batch.mask, 3),
+            'max_oi_strike': [
+                int(s[0]) for s in _top_strikes(batch, ce_oi + pe_oi, batch.mask, 1)
+            ],
+        }
+
+    @staticmethod
+    def compute_all(batch: ChainBatch) -> pd.DataFrame:
+        """Every indicator for every symbol, one row per symbol"""
+        columns = {}
+        columns.update(BatchIndicators.calculate_pcr(batch))
+        columns['max_pain'] = BatchIndicators.calculate_max_pain(batch)
+        columns.update(BatchIndicators.calculate_iv_skew(batch))
+        columns.update(BatchIndicators.analyze_liquidity(batch))
+        columns.update(BatchIndicators.calculate_volume_oi_ratio(batch))
+        columns.update(BatchIndicators.find_support_resistance(batch))
+        return pd.DataFrame(columns, index=pd.Index(batch.symbols, name='symbol'))
+
+    @staticmethod
+    def cross_sectional(results: pd.DataFrame, metrics: List[str] = None) -> pd.DataFrame:
+        """
+        Add cross-sectional ranks and z-scores
+
+        Defaults to CROSS_SECTIONAL_METRICS. Ranks are 1 for the highest value;
+        z-scores use the population std and are NaN when it is zero.
+        """
+        if metrics is None:
+            metrics = BatchIndicators.CROSS_SECTIONAL_METRICS
+
+        values = results[metrics].astype(float)
+        ranks = values.rank(ascending=False, method='min').add_suffix('_rank')
+        std = values.std(ddof=0).replace(0, np.nan)
+        zscores = ((values - values.mean()) / std).round(3).add_suffix('_z')
+        return pd.concat([results, ranks, zscores], axis=1)
+
+
+if __name__ == "__main__":
+    print("Batch indicators module loaded successfully")
@@ -3,11 +3,11 @@ NSE Data Fetcher Module
 Handles all data fetching operations from NSE
 """
 
-import requests
 import time
 import random
 import logging
 from typing import Dict, Optional
+from urllib.parse import quote
 import sys
 import os
 
@@ -17,6 +17,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import NSEConfig
 from utils.nse_bypass import NSEBypass
 from utils.rate_limiter import RateLimiter
+from utils.transport import HTTPTransport
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +27,8 @@ class NSEDataFetcher:
     Fetches option chain data from NSE with anti-blocking measures
     """
     
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, transport: Optional[HTTPTransport] = None):
+        self.session = transport or HTTPTransport()
         self.bypass = NSEBypass(self.session)
         self.rate_limiter = RateLimiter(
             min_delay=NSEConfig.MIN_REQUEST_DELAY,
@@ -40,7 +41,7 @@ class NSEDataFetcher:
         Fetch option chain data from NSE
         
         Args:
-            symbol: Index symbol (NIFTY, BANKNIFTY, etc.)
+            symbol: Index symbol (NIFTY, BANKNIFTY, etc.) or stock symbol
             
         Returns:
             Option chain data as dictionary or None
@@ -56,17 +57,26 @@ class NSEDataFetcher:
             time.sleep(1)
         
         try:
-            url = f"{NSEConfig.OPTION_CHAIN_URL}?symbol={symbol}"
+            if symbol in NSEConfig.INDEX_SYMBOLS:
+                base_url = NSEConfig.OPTION_CHAIN_URL
+            else:
+                base_url = NSEConfig.OPTION_CHAIN_EQUITY_URL
+            url = f"{base_url}?symbol={quote(symbol)}"
             
+            # Cookies live in the transport's shared jar
             response = self.session.get(
                 url,
-                cookies=self.cookies,
                 timeout=NSEConfig.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
                 data = response.json()
-                logger.info(f"✓ Successfully fetched option chain for {symbol}")
+                stats = response.transfer_stats
+                logger.info(
+                    f"✓ Successfully fetched option chain for {symbol} "
+                    f"({stats['wire_bytes']} bytes on wire, {stats['decoded_bytes']} decoded, "
+                    f"TTFB {stats['ttfb_ms']}ms)"
+                )
                 return data
             elif response.status_code == 401:
                 # Unauthorized - refresh cookies
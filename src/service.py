@@ -0,0 +1,420 @@
+"""
+Analysis Service Module
+Long-lived local HTTP service that keeps option chains and analyses warm
+"""
+
+import json
+import time
+import logging
+import threading
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, List, Optional
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ServiceConfig, AlertConfig
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamError(Exception):
+    """Raised when an option chain cannot be fetched from NSE"""
+
+
+class AnalysisService:
+    """
+    Caches parsed option chains and their analyses per symbol and expiry
+    """
+
+    QUERIES = ('pcr', 'max_pain', 'levels', 'strategies', 'analysis', 'expiries')
+
+    def __init__(self, cache_ttl: float = ServiceConfig.CACHE_TTL):
+        # pandas/numpy are only pulled in once a service is actually created
+        from src.data_fetcher import NSEDataFetcher
+        from src.analyzer import OptionChainAnalyzer
+        from src.indicators import OptionIndicators
+        from src.strategies import StrategyGenerator
+
+        self.fetcher = NSEDataFetcher()
+        self.analyzer = OptionChainAnalyzer()
+        self.indicators = OptionIndicators()
+        self.strategy_class = StrategyGenerator
+        self.cache_ttl = cache_ttl
+        self.alert_engine = None
+
+        self._chains = {}
+        self._lock = threading.Lock()
+        # The fetcher's session is shared, so only one fetch runs at a time
+        self._fetch_lock = threading.Lock()
+
+    def _fresh_chain(self, symbol: str) -> Optional[Dict]:
+        """Return the cached chain for a symbol if it has not expired"""
+        with self._lock:
+            chain = self._chains.get(symbol)
+        if chain and time.monotonic() - chain['fetched_at'] < self.cache_ttl:
+            return chain
+        return None
+
+    def get_chain(self, symbol: str, refresh: bool = False) -> Optional[Dict]:
+        """
+        Get the parsed option chain for a symbol, fetching it on a cache miss
+
+        Args:
+            symbol: Index (NIFTY, BANKNIFTY, etc.) or stock symbol
+            refresh: Ignore the cache and fetch again
+
+        Returns:
+            Chain entry with DataFrame, spot price and expiries, or None
+        """
+        if not refresh:
+            chain = self._fresh_chain(symbol)
+            if chain:
+                return chain
+
+        with self._fetch_lock:
+            # Another thread may have fetched while we were waiting
+            if not refresh:
+                chain = self._fresh_chain(symbol)
+                if chain:
+                    return chain
+
+            raw_data = self.fetcher.fetch_option_chain(symbol)
+            if not raw_data:
+                return None
+
+            df = self.analyzer.parse_option_data(raw_data)
+            if df.empty:
+                return None
+
+            chain = {
+                'df': df,
+                'spot_price': self.fetcher.get_spot_price(raw_data),
+                'expiries': self.fetcher.get_expiry_dates(raw_data),
+                'fetched_at': time.monotonic(),
+                'analyses': {}
+            }
+            with self._lock:
+                self._chains[symbol] = chain
+            return chain
+
+    def _analyze(self, symbol: str, df, spot_price: float) -> Dict:
+        """Run the full analysis pipeline on a parsed chain"""
+        pcr_oi, pcr_vol = self.analyzer.calculate_pcr(df)
+
+        analysis = {
+            'pcr': {'oi': pcr_oi, 'volume': pcr_vol},
+            'max_pain': self.analyzer.calculate_max_pain(df),
+            'oi_changes': self.analyzer.analyze_oi_changes(df),
+            'iv_skew': self.indicators.calculate_iv_skew(df, spot_price),
+            'liquidity': self.indicators.analyze_liquidity(df),
+            'volume_oi_ratio': self.indicators.calculate_volume_oi_ratio(df),
+            'support_resistance': self.indicators.find_support_resistance(df)
+        }
+
+        strategy_gen = self.strategy_class(analysis, symbol, spot_price)
+        analysis['strategies'] = strategy_gen.generate_all_strategies()
+        return analysis
+
+    def get_analysis(self, symbol: str, expiry: Optional[str] = None,
+                     refresh: bool = False) -> Optional[Dict]:
+        """
+        Get the analysis for a symbol, optionally limited to one expiry
+
+        Args:
+            symbol: Index (NIFTY, BANKNIFTY, etc.) or stock symbol
+            expiry: Expiry date as reported by NSE, or None for all expiries
+            refresh: Ignore the cache and fetch again
+
+        Returns:
+            Analysis dictionary or None
+        """
+        chain = self.get_chain(symbol, refresh)
+        if not chain:
+            return None
+
+        analyses = chain['analyses']
+        if expiry in analyses:
+            return analyses[expiry]
+
+        df = chain['df']
+        if expiry:
+            df = df[df['expiryDate'] == expiry].reset_index(drop=True)
+            if df.empty:
+                return None
+        else:
+            # Indicators add columns, keep the cached frame untouched
+            df = df.copy()
+
+        analysis = self._analyze(symbol, df, chain['spot_price'])
+        analysis.update({
+            'symbol': symbol,
+            'expiry': expiry,
+            'spot_price': chain['spot_price']
+        })
+        analyses[expiry] = analysis
+        return analysis
+
+    def query(self, name: str, symbol: str, expiry: Optional[str] = None,
+              refresh: bool = False) -> Optional[Dict]:
+        """
+        Answer a single named query for a symbol
+
+        Returns:
+            Query result, or None if the expiry matches no rows
+
+        Raises:
+            UpstreamError: If the option chain could not be fetched
+        """
+        chain = self.get_chain(symbol, refresh)
+        if not chain:
+            raise UpstreamError(f"Could not fetch option chain for {symbol}")
+
+        if name == 'expiries':
+            return {'symbol': symbol, 'expiries': chain['expiries']}
+
+        analysis = self.get_analysis(symbol, expiry)
+        if not analysis:
+            return None
+
+        result = {'symbol': symbol, 'expiry': expiry}
+        if name == 'pcr':
+            result['pcr'] = analysis['pcr']
+        elif name == 'max_pain':
+            result['max_pain'] = analysis['max_pain']
+        elif name == 'levels':
+            result['levels'] = analysis['support_resistance']
+        elif name == 'strategies':
+            result['strategies'] = analysis['strategies']
+        else:
+            result = analysis
+        return result
+
+    def compare(self, symbols: List[str], expiry: Optional[str] = None,
+                refresh: bool = False) -> Optional[Dict]:
+        """
+        Cross-sectional indicators, ranks and z-scores across symbols
+
+        Args:
+            symbols: Symbols to compare; ones that cannot be fetched are skipped
+            expiry: Expiry date to restrict every chain to, or None
+            refresh: Ignore the cache and fetch again
+
+        Returns:
+            One row per symbol (missing values as None), or None if the
+            expiry matches no rows in any fetched chain
+
+        Raises:
+            UpstreamError: If none of the option chains could be fetched
+        """
+        from src.batch_indicators import ChainBatch, BatchIndicators
+
+        fetched = 0
+        chains = {}
+        for symbol in symbols:
+            chain = self.get_chain(symbol, refresh)
+            if not chain:
+                continue
+            fetched += 1
+            df = chain['df']
+            if expiry:
+                df = df[df['expiryDate'] == expiry]
+            if not df.empty:
+                chains[symbol] = (df, chain['spot_price'])
+
+        if not fetched:
+            raise UpstreamError(f"Could not fetch option chains for {', '.join(symbols)}")
+        if not chains:
+            return None
+
+        results = BatchIndicators.compute_all(ChainBatch(chains))
+        results = BatchIndicators.cross_sectional(results).reset_index()
+        # NaN is not valid JSON
+        results = results.astype(object).where(results.notna(), None)
+        return {'expiry': expiry, 'rows': results.to_dict('records')}
+
+    def poll(self, symbols: List[str], interval: float = AlertConfig.POLL_INTERVAL,
+             alert_engine=None, stop_event: Optional[threading.Event] = None):
+        """
+        Refresh symbols every `interval` seconds and evaluate alerts on each tick
+
+        Args:
+            symbols: Symbols to keep fresh
+            interval: Seconds between ticks
+            alert_engine: AlertEngine evaluated against every new analysis
+            stop_event: Set to end the loop
+        """
+        stop_event = stop_event or threading.Event()
+        self.alert_engine = alert_engine
+
+        while not stop_event.is_set():
+            started = time.monotonic()
+
+            for symbol in symbols:
+                try:
+                    chain = self.get_chain(symbol, refresh=True)
+                    if not chain:
+                        continue
+                    analysis = self.get_analysis(symbol)
+                    if analysis and alert_engine:
+                        alert_engine.evaluate(symbol, analysis, chain['fetched_at'])
+                except Exception as e:
+                    logger.error(f"Error polling {symbol}: {str(e)}")
+
+            stop_event.wait(max(0, interval - (time.monotonic() - started)))
+
+
+def _to_json(obj):
+    """Convert numpy scalars left in analysis results"""
+    if hasattr(obj, 'item'):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves GET /<query>?symbol=NIFTY&expiry=...&refresh=1
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        name = url.path.strip('/')
+        params = parse_qs(url.query)
+
+        if name == 'health':
+            self._send(200, {
+                'status': 'ok',
+                'transport': self.server.service.fetcher.session.summary()
+            })
+            return
+
+        if name == 'alerts':
+            engine = self.server.service.alert_engine
+            if not engine:
+                self._send(404, {'error': 'Alerts are not enabled'})
+                return
+            self._send(200, {
+                'latency': engine.latency_stats(),
+                'recent': list(engine.history)[-20:]
+            })
+            return
+
+        if name == 'compare':
+            symbols = [s.strip().upper() for s in params.get('symbols', [''])[0].split(',') if s.strip()]
+            expiry = params.get('expiry', [None])[0]
+            refresh = params.get('refresh', ['0'])[0] in ('1', 'true')
+            if not symbols:
+                self._send(400, {'error': 'compare needs symbols=A,B,...'})
+                return
+            try:
+                result = self.server.service.compare(symbols, expiry, refresh)
+            except UpstreamError as e:
+                self._send(502, {'error': str(e)})
+                return
+            except Exception as e:
+                logger.error(f"Error comparing {symbols}: {str(e)}")
+                self._send(500, {'error': str(e)})
+                return
+            if result is None:
+                self._send(404, {'error': f'No data for requested symbols expiry {expiry}'})
+            else:
+                self._send(200, result)
+            return
+
+        if name not in AnalysisService.QUERIES:
+            self._send(404, {'error': f'Unknown query: {name}'})
+            return
+
+        symbol = params.get('symbol', ['NIFTY'])[0].upper()
+        expiry = params.get('expiry', [None])[0]
+        refresh = params.get('refresh', ['0'])[0] in ('1', 'true')
+
+        try:
+            result = self.server.service.query(name, symbol, expiry, refresh)
+        except UpstreamError as e:
+            self._send(502, {'error': str(e)})
+            return
+        except Exception as e:
+            logger.error(f"Error answering {name} for {symbol}: {str(e)}")
+            self._send(500, {'error': str(e)})
+            return
+
+        if result is None:
+            self._send(404, {'error': f'No data for {symbol} expiry {expiry}'})
+        else:
+            self._send(200, result)
+
+    def _send(self, status: int, payload: Dict):
+        body = json.dumps(payload, default=_to_json).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def serve(host: str = ServiceConfig.HOST, port: int = ServiceConfig.PORT,
+          cache_ttl: float = ServiceConfig.CACHE_TTL,
+          poll_symbols: Optional[List[str]] = None,
+          poll_interval: float = AlertConfig.POLL_INTERVAL,
+          alert_sinks: Optional[List] = None):
+    """Start the analysis service and block until interrupted"""
+    server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    server.service = AnalysisService(cache_ttl)
+
+    if poll_symbols:
+        from src.alerts import AlertEngine
+
+        engine = AlertEngine(sinks=alert_sinks)
+        server.service.alert_engine = engine
+        poller = threading.Thread(
+            target=server.service.poll,
+            args=(poll_symbols, poll_interval, engine),
+            daemon=True
+        )
+        poller.start()
+        logger.info(f"✓ Polling {', '.join(poll_symbols)} every {poll_interval}s")
+
+    logger.info(f"✓ Analysis service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description="NSE option chain analysis service")
+    parser.add_argument('--host', default=ServiceConfig.HOST)
+    parser.add_argument('--port', type=int, default=ServiceConfig.PORT)
+    parser.add_argument('--cache-ttl', type=float, default=ServiceConfig.CACHE_TTL)
+    parser.add_argument('--poll', help="Comma separated symbols to poll for alerts")
+    parser.add_argument('--interval', type=float, default=AlertConfig.POLL_INTERVAL)
+    parser.add_argument('--alert-file', help="Append alerts to this file")
+    parser.add_argument('--alert-webhook', help="POST alerts to this URL")
+    args = parser.parse_args()
+
+    poll_symbols = [s.strip().upper() for s in args.poll.split(',')] if args.poll else None
+    sinks = None
+    if poll_symbols:
+        from src.alerts import StdoutSink, FileSink, WebhookSink
+
+        sinks = [StdoutSink()]
+        if args.alert_file:
+            sinks.append(FileSink(args.alert_file))
+        if args.alert_webhook:
+            sinks.append(WebhookSink(args.alert_webhook))
+
+    serve(args.host, args.port, args.cache_ttl, poll_symbols, args.interval, sinks)
@@ -0,0 +1,84 @@
+"""
+Tests for the alert engine rules
+"""
+
+from src.alerts import AlertEngine, ThresholdRule, ChangeRule, NewMemberRule
+
+
+def replay(rule, values, symbol='NIFTY'):
+    """Feed one value per tick and return the messages raised"""
+    rule.metric = lambda analysis: analysis['value']
+    return [alert['message'] for alert in
+            (rule.evaluate(symbol, {'value': v}) for v in values) if alert]
+
+
+def test_threshold_rule_debounces_and_rearms_with_hysteresis():
+    rule = ThresholdRule('PCR', None, 1.3, 'above', hysteresis=0.05, debounce=2)
+    alerts = replay(rule, [1.0, 1.4, 1.45, 1.32, 1.4, 1.2, 1.4, 1.5, 1.6])
+
+    # 1.32 stays inside the hysteresis band, only 1.2 re-arms the rule
+    assert alerts == [
+        'PCR: 1.45 crossed above 1.3',
+        'PCR: 1.5 crossed above 1.3',
+    ]
+
+
+def test_threshold_rule_ignores_single_tick_spikes():
+    rule = ThresholdRule('PCR', None, 0.7, 'below', debounce=2)
+    assert replay(rule, [0.8, 0.6, 0.8, 0.6, 0.8]) == []
+
+
+def test_change_rule_keeps_alerting_during_steady_trend():
+    rule = ChangeRule('Max Pain', None, {'NIFTY': 50}, debounce=2)
+    alerts = replay(rule, [22000, 22100, 22200, 22300, 22400, 22500, 22600])
+
+    assert alerts == [
+        'Max Pain: moved from 22000 to 22200',
+        'Max Pain: moved from 22200 to 22400',
+        'Max Pain: moved from 22400 to 22600',
+    ]
+
+
+def test_change_rule_skips_symbols_without_step():
+    rule = ChangeRule('Max Pain', None, {'NIFTY': 50}, debounce=1)
+    assert replay(rule, [100, 500, 900], symbol='RELIANCE') == []
+
+
+def test_new_member_rule_reports_every_new_level():
+    rule = NewMemberRule('Resistance', None, debounce=1)
+    alerts = replay(rule, [[1, 2, 4], [1, 5, 4], [1, 5, 6], [1, 7, 6]])
+
+    assert alerts == ['Resistance: [5]', 'Resistance: [6]', 'Resistance: [7]']
+
+
+def test_new_member_rule_debounces_flapping_level():
+    rule = NewMemberRule('Resistance', None, debounce=2)
+    alerts = replay(rule, [[1, 2], [1, 3], [1, 2], [1, 3], [1, 3], [1, 4], [1, 4]])
+
+    assert alerts == ['Resistance: [3]', 'Resistance: [4]']
+
+
+def test_new_member_rule_ignores_a_different_level_each_tick():
+    rule = NewMemberRule('R', None, debounce=2)
+    assert replay(rule, [[1, 2], [1, 3], [1, 4], [1, 5], [1, 6]]) == []
+
+    rule = NewMemberRule('R', None, debounce=2)
+    assert replay(rule, [[1, 2], [1, 3], [1, 4], [1, 4]]) == ['R: [4]']
+
+
+def test_engine_delivers_alerts_to_sinks_and_reports_latency():
+    received = []
+
+    class ListSink:
+        def send(self, alert):
+            received.append(alert['rule'])
+
+    rule = ThresholdRule('PCR', 'pcr.oi', 1.3, 'above', debounce=1)
+    engine = AlertEngine(rules=[rule], sinks=[ListSink()])
+    for pcr in (1.0, 1.5, 1.0, 1.5):
+        engine.evaluate('NIFTY', {'pcr': {'oi': pcr}})
+    engine.stop()
+
+    assert received == ['PCR', 'PCR']
+    assert all('T' in alert['timestamp'] for alert in engine.history)
+    assert engine.latency_stats()['count'] == 2
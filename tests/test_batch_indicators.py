@@ -0,0 +1,119 @@
+"""
+Equivalence tests: batch indicators against the per-symbol implementation
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pd = pytest.importorskip('pandas')
+
+from src.analyzer import OptionChainAnalyzer
+from src.indicators import OptionIndicators
+from src.batch_indicators import ChainBatch, BatchIndicators
+
+
+def make_chain(rng, n, base, shuffle=False, expiries=1):
+    """Synthetic parsed chain; several expiries repeat every strike"""
+    strikes = np.tile(base + 50 * np.arange(n), expiries).astype(float)
+    if shuffle:
+        strikes = rng.permutation(strikes)
+    size = len(strikes)
+
+    df = pd.DataFrame({'strike': strikes, 'expiryDate': 'x'})
+    for side in ('CE', 'PE'):
+        df[f'{side}_OI'] = rng.integers(0, 100000, size).astype(float)
+        df[f'{side}_changeInOI'] = 0.0
+        df[f'{side}_volume'] = rng.integers(0, 20000, size).astype(float)
+        df[f'{side}_IV'] = rng.uniform(0, 30, size).round(2)
+        df[f'{side}_LTP'] = rng.choice([0, 10, 50, 100], size).astype(float)
+        df[f'{side}_bid'] = rng.uniform(0, 100, size).round(1)
+        df[f'{side}_ask'] = df[f'{side}_bid'] + rng.uniform(0, 5, size).round(1)
+    return df, base + 50 * n / 2 + 7
+
+
+@pytest.fixture(scope='module')
+def chains():
+    rng = np.random.default_rng(0)
+    chains = {}
+    for k in range(12):
+        n = int(rng.integers(15, 60))
+        chains[f'S{k}'] = make_chain(rng, n, 20000 + k * 10,
+                                     shuffle=k % 3 == 0, expiries=1 + k % 2)
+
+    # OI ties between duplicate strikes exercise top-k tie-breaking
+    df, spot = make_chain(rng, 10, 20000, expiries=3)
+    df['CE_OI'] = 1000.0
+    df['PE_OI'] = np.tile(np.arange(10, dtype=float), 3)
+    chains['TIES'] = (df, spot)
+    return chains
+
+
+@pytest.fixture(scope='module')
+def results(chains):
+    return BatchIndicators.compute_all(ChainBatch(chains))
+
+
+def close(a, b):
+    return np.allclose(np.array(a, dtype=float), np.array(b, dtype=float), equal_nan=True)
+
+
+def test_batch_matches_per_symbol(chains, results):
+    # Random OI rarely ties for max pain; see test_max_pain_ties_resolve_to_first_row
+    for symbol, (df, spot) in chains.items():
+        df = df.copy()
+        row = results.loc[symbol]
+
+        pcr_oi, pcr_vol = OptionChainAnalyzer.calculate_pcr(df)
+        skew = OptionIndicators.calculate_iv_skew(df, spot)
+        liquidity = OptionIndicators.analyze_liquidity(df)
+        vol_oi = OptionIndicators.calculate_volume_oi_ratio(df)
+        levels = OptionIndicators.find_support_resistance(df)
+
+        assert close([pcr_oi, pcr_vol], [row.pcr_oi, row.pcr_volume]), symbol
+        assert OptionChainAnalyzer.calculate_max_pain(df) == row.max_pain, symbol
+        for key in ('atm_strike', 'atm_iv', 'put_skew', 'call_skew'):
+            assert close(skew[key], row[key]), (symbol, key)
+        for key in ('liquid_ce_strikes', 'liquid_pe_strikes', 'avg_ce_spread', 'avg_pe_spread'):
+            assert close(liquidity[key], row[key]), (symbol, key)
+        for key in ('avg_ce_ratio', 'avg_pe_ratio',
+                    'high_activity_ce_strikes', 'high_activity_pe_strikes'):
+            assert close(vol_oi[key], row[key]), (symbol, key)
+        assert levels['resistance_levels'] == row.resistance_levels, symbol
+        assert levels['support_levels'] == row.support_levels, symbol
+        assert levels['max_oi_strike'] == row.max_oi_strike, symbol
+
+
+def test_max_pain_ties_resolve_to_first_row():
+    rng = np.random.default_rng(1)
+    chains = {}
+    for k in range(20):
+        # Pain is flat from 20050 to 20200; shuffled rows decide which
+        # of those strikes comes first
+        strikes = 20000 + 50 * np.arange(6)
+        ce = np.array([10, 10, 0, 0, 0, 0], dtype=float)
+        pe = np.array([0, 0, 0, 0, 10, 10], dtype=float)
+        order = rng.permutation(6)
+        df = pd.DataFrame({'strike': strikes[order].astype(float),
+                           'CE_OI': ce[order], 'PE_OI': pe[order]})
+        chains[f'F{k}'] = (df, 20100.0)
+
+    batch_max_pain = BatchIndicators.calculate_max_pain(ChainBatch(chains))
+    expected = [OptionChainAnalyzer.calculate_max_pain(df) for df, _ in chains.values()]
+
+    assert batch_max_pain.tolist() == expected
+    assert len(set(expected)) > 1
+
+
+def test_flat_arrays_are_indexed_by_offsets(chains):
+    batch = ChainBatch(chains)
+    for symbol, (df, _) in chains.items():
+        assert np.array_equal(batch.flat['strike'][batch.index_of(symbol)], df['strike'].to_numpy())
+
+
+def test_cross_sectional_skips_strike_levels(results):
+    ranked = BatchIndicators.cross_sectional(results)
+
+    assert 'pcr_oi_rank' in ranked and 'put_skew_z' in ranked
+    for level in ('atm_strike', 'max_pain', 'max_oi_strike'):
+        assert f'{level}_rank' not in ranked and f'{level}_z' not in ranked
+    assert ranked['pcr_oi_rank'].min() == 1
@@ -0,0 +1,162 @@
+"""
+Tests for the analysis service cache and HTTP handler
+"""
+
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+pytest.importorskip('requests')
+
+from src.service import AnalysisService, ServiceRequestHandler, _to_json
+
+
+EXPIRIES = ['26-Dec-2026', '02-Jan-2027']
+
+
+def option(oi, iv):
+    return {
+        'openInterest': oi, 'changeinOpenInterest': oi // 10,
+        'totalTradedVolume': oi // 2, 'impliedVolatility': iv,
+        'lastPrice': 100.0, 'bidprice': 99.0, 'askPrice': 101.0,
+    }
+
+
+class StubFetcher:
+    """Stands in for NSEDataFetcher and counts fetches"""
+
+    def __init__(self):
+        self.calls = 0
+        self.available = True
+
+    def fetch_option_chain(self, symbol):
+        self.calls += 1
+        if not self.available:
+            return None
+        data = [
+            {
+                'strikePrice': 24000 + 50 * i,
+                'expiryDate': expiry,
+                'CE': option(1000 * (i + 1), 12 + i / 10),
+                'PE': option(1000 * (10 - i), 14 - i / 10),
+            }
+            for expiry in EXPIRIES for i in range(10)
+        ]
+        return {'records': {'data': data, 'underlyingValue': 24210.0, 'expiryDates': EXPIRIES}}
+
+    def get_spot_price(self, data):
+        return float(data['records']['underlyingValue'])
+
+    def get_expiry_dates(self, data):
+        return data['records']['expiryDates']
+
+
+@pytest.fixture
+def service():
+    service = AnalysisService(cache_ttl=60)
+    service.fetcher = StubFetcher()
+    return service
+
+
+@pytest.fixture
+def base_url(service):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ServiceRequestHandler)
+    server.service = service
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url):
+    try:
+        with urlopen(url, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_cache_hit_does_not_refetch(service):
+    first = service.query('pcr', 'NIFTY')
+    second = service.query('pcr', 'NIFTY')
+
+    assert first == second
+    assert service.fetcher.calls == 1
+
+
+def test_analysis_is_cached_per_expiry(service):
+    full = service.get_analysis('NIFTY')
+    near = service.get_analysis('NIFTY', EXPIRIES[0])
+
+    assert near is not full
+    assert service.get_analysis('NIFTY', EXPIRIES[0]) is near
+    assert service.fetcher.calls == 1
+
+
+def test_refresh_refetches(service):
+    service.query('pcr', 'NIFTY')
+    service.query('pcr', 'NIFTY', refresh=True)
+
+    assert service.fetcher.calls == 2
+
+
+def test_ttl_expiry_refetches(service):
+    service.query('pcr', 'NIFTY')
+    service._chains['NIFTY']['fetched_at'] -= service.cache_ttl + 1
+    service.query('pcr', 'NIFTY')
+
+    assert service.fetcher.calls == 2
+
+
+def test_unknown_expiry_returns_404(base_url):
+    status, body = get(f"{base_url}/pcr?symbol=NIFTY&expiry=01-Jan-2000")
+
+    assert status == 404
+    assert '01-Jan-2000' in body['error']
+
+
+def test_failed_fetch_returns_502(service, base_url):
+    service.fetcher.available = False
+    status, body = get(f"{base_url}/pcr?symbol=NIFTY")
+
+    assert status == 502
+    assert 'NIFTY' in body['error']
+
+
+def test_query_over_http(base_url):
+    status, body = get(f"{base_url}/levels?symbol=nifty&expiry={EXPIRIES[0]}")
+
+    assert status == 200
+    assert body['symbol'] == 'NIFTY'
+    assert body['levels']['resistance_levels'][0] == 24450
+
+
+def test_compare_without_symbols_returns_400(service, base_url):
+    status, _ = get(f"{base_url}/compare?symbols=")
+
+    assert status == 400
+    assert service.fetcher.calls == 0
+
+
+def test_compare_ranks_symbols(base_url):
+    status, body = get(f"{base_url}/compare?symbols=NIFTY,BANKNIFTY&expiry={EXPIRIES[0]}")
+
+    assert status == 200
+    assert [row['symbol'] for row in body['rows']] == ['NIFTY', 'BANKNIFTY']
+    assert 'max_pain_rank' not in body['rows'][0]
+
+
+def test_to_json_converts_numpy_scalars():
+    payload = {'strike': np.int64(24000), 'iv': np.float64(12.5), 'build': np.bool_(True)}
+
+    assert json.loads(json.dumps(payload, default=_to_json)) == {
+        'strike': 24000, 'iv': 12.5, 'build': True
+    }
+    with pytest.raises(TypeError):
+        json.dumps({'x': object()}, default=_to_json)
@@ -0,0 +1,91 @@
+"""
+Tests for transport content decoding
+"""
+
+import gzip
+import zlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('requests')
+
+from utils.transport import (
+    CODECS, ContentDecodingError, HTTPTransport, accept_encoding, decode_body
+)
+
+
+def test_decode_body_handles_gzip_and_both_deflate_forms():
+    data = b'{"records": {}}' * 100
+    raw_deflate = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+
+    assert decode_body(gzip.compress(data), 'gzip') == data
+    assert decode_body(zlib.compress(data), 'deflate') == data
+    assert decode_body(raw_deflate.compress(data) + raw_deflate.flush(), 'deflate') == data
+    assert decode_body(data, 'identity') == data
+
+
+def test_decode_body_rejects_corrupt_and_unknown_encodings():
+    with pytest.raises(ContentDecodingError):
+        decode_body(b'not gzip', 'gzip')
+    with pytest.raises(ContentDecodingError):
+        decode_body(b'data', 'compress')
+
+
+def test_accept_encoding_only_offers_supported_codecs():
+    assert accept_encoding({'gzip': None, 'deflate': None}) == 'gzip, deflate;q=0.9'
+    offered = accept_encoding()
+    assert all(name.split(';')[0] in CODECS for name in offered.split(', '))
+
+
+@pytest.mark.skipif('zstd' not in CODECS, reason="zstandard not installed")
+def test_decode_body_reads_every_zstd_frame():
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor()
+    data = compressor.compress(b'first,') + compressor.compress(b'second')
+
+    assert decode_body(data, 'zstd') == b'first,second'
+    with pytest.raises(ContentDecodingError):
+        decode_body(data[:-3], 'zstd')
+
+
+def test_get_attaches_stats_to_each_response():
+    data = b'{"records": {}}' * 100
+    body = gzip.compress(data)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Content-Encoding', 'gzip')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    transport = HTTPTransport()
+    responses = []
+    threads = [threading.Thread(target=lambda: responses.append(transport.get(url, timeout=5)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+    server.server_close()
+
+    assert len(responses) == 4
+    for response in responses:
+        assert response.content == data
+        assert response.transfer_stats['wire_bytes'] == len(body)
+        assert response.transfer_stats['decoded_bytes'] == len(data)
+    assert transport.summary()['requests'] == 4
@@ -14,12 +14,12 @@ class NSEBypass:
     Manages NSE anti-blocking measures
     """
     
-    # Headers to mimic browser
+    # Headers to mimic browser (Accept-Encoding is left to the transport,
+    # which only offers codecs it can decode)
     HEADERS = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'application/json, text/plain, */*',
         'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
         'Connection': 'keep-alive',
         'DNT': '1',
         'Pragma': 'no-cache',
@@ -27,7 +27,11 @@ class NSEBypass:
         'Referer': 'https://www.nseindia.com/option-chain'
     }
     
-    def __init__(self, session: requests.Session):
+    def __init__(self, session):
+        """
+        Args:
+            session: requests.Session or HTTPTransport
+        """
         self.session = session
         self.session.headers.update(self.HEADERS)
     
@@ -0,0 +1,309 @@
+"""
+HTTP Transport Utility
+Pooled, keep-alive HTTP with compression negotiation and payload-size accounting
+"""
+
+import time
+import zlib
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+import sys
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar
+from requests.structures import CaseInsensitiveDict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import TransportConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _inflate(data: bytes) -> bytes:
+    """Decode 'deflate', which servers send both zlib-wrapped and raw"""
+    try:
+        return zlib.decompress(data)
+    except zlib.error:
+        return zlib.decompress(data, -zlib.MAX_WBITS)
+
+
+# Decoders for every content encoding we can handle in this environment
+CODECS = {
+    'identity': lambda data: data,
+    'gzip': lambda data: zlib.decompress(data, 16 + zlib.MAX_WBITS),
+    'deflate': _inflate,
+}
+
+try:
+    import brotli
+    CODECS['br'] = brotli.decompress
+except ImportError:
+    try:
+        import brotlicffi
+        CODECS['br'] = brotlicffi.decompress
+    except ImportError:
+        pass
+
+try:
+    import zstandard
+
+    def _unzstd(data: bytes) -> bytes:
+        """Decode every zstd frame, not just the first"""
+        chunks = []
+        while data:
+            decompressor = zstandard.ZstdDecompressor().decompressobj()
+            chunks.append(decompressor.decompress(data))
+            if not decompressor.eof:
+                raise zstandard.ZstdError("truncated zstd frame")
+            data = decompressor.unused_data
+        return b''.join(chunks)
+
+    CODECS['zstd'] = _unzstd
+except ImportError:
+    pass
+
+
+class ContentDecodingError(Exception):
+    """Raised when a response body cannot be decoded"""
+
+
+def accept_encoding(supported=None,
+                    preference: List[str] = TransportConfig.ENCODING_PREFERENCE) -> str:
+    """
+    Accept-Encoding header offering only encodings the client can decode
+
+    Args:
+        supported: Encodings the decoder handles (defaults to CODECS)
+        preference: Encodings in order of preference
+    """
+    if supported is None:
+        supported = CODECS
+    available = [name for name in preference if name in supported]
+    return ', '.join(
+        name if i == 0 else f"{name};q={max(0.1, 1 - i / 10):.1f}"
+        for i, name in enumerate(available)
+    )
+
+
+def _encodings(content_encoding: str) -> List[str]:
+    """Encodings in a Content-Encoding header, outermost first"""
+    return [e for e in reversed([e.strip().lower() for e in content_encoding.split(',')])
+            if e and e != 'identity']
+
+
+def decode_body(data: bytes, content_encoding: str) -> bytes:
+    """
+    Undo every encoding listed in a Content-Encoding header
+
+    Raises:
+        ContentDecodingError: If an encoding is unsupported or the data is corrupt
+    """
+    for encoding in _encodings(content_encoding):
+        if encoding not in CODECS:
+            raise ContentDecodingError(f"Unsupported content encoding '{encoding}'")
+        try:
+            data = CODECS[encoding](data)
+        except Exception as e:
+            raise ContentDecodingError(f"Corrupt '{encoding}' body: {str(e)}") from e
+    return data
+
+
+class HTTPTransport:
+    """
+    Session-like HTTP client shared by the fetcher and NSEBypass
+
+    With requests, each thread gets its own Session, but all of them share one
+    connection pool, one header set and one cookie jar. With HTTP/2 enabled
+    and httpx installed, a single thread-safe httpx.Client is used instead.
+    """
+
+    def __init__(self, pool_connections: int = TransportConfig.POOL_CONNECTIONS,
+                 pool_maxsize: int = TransportConfig.POOL_MAXSIZE,
+                 http2: bool = TransportConfig.ENABLE_HTTP2):
+        self.history = deque(maxlen=TransportConfig.STATS_HISTORY)
+        self._client = None
+
+        if http2:
+            try:
+                import httpx
+                import h2  # noqa: F401  httpx needs it for HTTP/2
+
+                self._client = httpx.Client(
+                    http2=True,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=pool_maxsize,
+                        max_keepalive_connections=pool_maxsize
+                    )
+                )
+            except ImportError:
+                logger.warning("HTTP/2 requested but httpx[http2] is not installed, using HTTP/1.1")
+
+        if self._client is not None:
+            # httpx decodes the body itself, so only offer what it can decode
+            try:
+                from httpx._decoders import SUPPORTED_DECODERS
+                self._httpx_encodings = set(SUPPORTED_DECODERS)
+            except ImportError:
+                self._httpx_encodings = {'gzip', 'deflate', 'identity'}
+
+            self.headers = self._client.headers
+            self.cookies = self._client.cookies
+            self.headers['Accept-Encoding'] = accept_encoding(self._httpx_encodings)
+        else:
+            self._adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize
+            )
+            self._local = threading.local()
+            self.headers = CaseInsensitiveDict(requests.utils.default_headers())
+            self.cookies = RequestsCookieJar()
+            self.headers['Accept-Encoding'] = accept_encoding()
+
+    def _session(self) -> requests.Session:
+        """This thread's Session, bound to the shared pool, headers and cookies"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            session.headers = self.headers
+            session.cookies = self.cookies
+            self._local.session = session
+        return session
+
+    def get(self, url: str, **kwargs):
+        """
+        GET a URL and record its transfer statistics
+
+        Returns:
+            requests.Response (or httpx.Response with HTTP/2) with the body
+            loaded and this transfer's statistics in `transfer_stats`
+
+        Raises:
+            ContentDecodingError: If the body cannot be decoded
+        """
+        if self._client is not None:
+            return self._get_httpx(url, **kwargs)
+        return self._get_requests(url, **kwargs)
+
+    def _get_requests(self, url: str, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        response = self._session().get(url, stream=True, **kwargs)
+        ttfb = time.perf_counter() - start
+
+        # Read the body as it came over the wire, then decode it ourselves
+        wire = response.raw.read(decode_content=False)
+        received = time.perf_counter()
+        encoding = response.headers.get('Content-Encoding', 'identity')
+        try:
+            body = decode_body(wire, encoding)
+        finally:
+            response.raw.release_conn()
+        decoded = time.perf_counter()
+
+        response._content = body
+        response._content_consumed = True
+
+        response.transfer_stats = self._record(
+            url, response.status_code, encoding, len(wire), len(body),
+            ttfb, decoded - start, decoded - received,
+            'HTTP/1.0' if response.raw.version == 10 else 'HTTP/1.1'
+        )
+        return response
+
+    def _get_httpx(self, url: str, **kwargs):
+        import httpx
+
+        start = time.perf_counter()
+        with self._client.stream('GET', url, **kwargs) as response:
+            ttfb = time.perf_counter() - start
+            # httpx passes unknown encodings through undecoded
+            encoding = response.headers.get('Content-Encoding', 'identity')
+            for name in _encodings(encoding):
+                if name not in self._httpx_encodings:
+                    raise ContentDecodingError(f"Unsupported content encoding '{name}'")
+            try:
+                response.read()
+            except httpx.DecodingError as e:
+                raise ContentDecodingError(f"Corrupt '{encoding}' body: {str(e)}") from e
+        total = time.perf_counter() - start
+
+        # httpx decodes while reading, so decode time is not separable here
+        response.transfer_stats = self._record(
+            url, response.status_code, encoding,
+            response.num_bytes_downloaded, len(response.content),
+            ttfb, total, None, response.http_version
+        )
+        return response
+
+    def _record(self, url: str, status: int, encoding: str, wire_bytes: int,
+                decoded_bytes: int, ttfb: float, total: float,
+                decode: Optional[float], http_version: str) -> Dict:
+        stats = {
+            'url': url,
+            'status': status,
+            'http_version': http_version,
+            'encoding': encoding,
+            'wire_bytes': wire_bytes,
+            'decoded_bytes': decoded_bytes,
+            'ttfb_ms': round(ttfb * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+            'decode_ms': round(decode * 1000, 3) if decode is not None else None
+        }
+        self.history.append(stats)
+        logger.debug(
+            f"{url}: {wire_bytes} wire / {decoded_bytes} decoded bytes ({encoding}), "
+            f"TTFB {stats['ttfb_ms']}ms, total {stats['total_ms']}ms"
+        )
+        return stats
+
+    @property
+    def last(self) -> Optional[Dict]:
+        """
+        Statistics for the most recent transfer on any thread
+
+        Use `response.transfer_stats` for a specific request.
+        """
+        return self.history[-1] if self.history else None
+
+    def summary(self) -> Dict:
+        """Aggregate statistics over recent transfers"""
+        transfers = list(self.history)
+        if not transfers:
+            return {'requests': 0, 'accept_encoding': self.headers.get('Accept-Encoding')}
+
+        wire = sum(t['wire_bytes'] for t in transfers)
+        decoded = sum(t['decoded_bytes'] for t in transfers)
+        decode_times = [t['decode_ms'] for t in transfers if t['decode_ms'] is not None]
+
+        return {
+            'requests': len(transfers),
+            'accept_encoding': self.headers.get('Accept-Encoding'),
+            'wire_bytes': wire,
+            'decoded_bytes': decoded,
+            'compression_ratio': round(decoded / wire, 2) if wire else None,
+            'avg_ttfb_ms': round(sum(t['ttfb_ms'] for t in transfers) / len(transfers), 2),
+            'avg_total_ms': round(sum(t['total_ms'] for t in transfers) / len(transfers), 2),
+            'avg_decode_ms': round(sum(decode_times) / len(decode_times), 3) if decode_times else None
+        }
+
+    def close(self):
+        """Close pooled connections"""
+        if self._client is not None:
+            self._client.close()
+        else:
+            self._adapter.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    transport = HTTPTransport()
+    print(f"Accept-Encoding: {transport.headers['Accept-Encoding']}")
+    transport.get("https://www.nseindia.com", timeout=10)
+    print(transport.summary())